@@ -1,38 +1,44 @@
 import os
+from dataclasses import dataclass, field
+from typing import Optional
 from dotenv import load_dotenv
 
 load_dotenv()
 
-class Config:
-    """Configuration for the RAG system"""
-    
+@dataclass(frozen=True)
+class Settings:
+    """Configuration for the RAG system, read from the environment once at import"""
+
     # OpenRouter API Configuration
-    OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
-    OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
-    
+    OPENROUTER_API_KEY: Optional[str] = field(default_factory=lambda: os.getenv("OPENROUTER_API_KEY"))
+    OPENROUTER_BASE_URL: str = "https://openrouter.ai/api/v1"
+
     # Meilisearch Configuration
-    MEILISEARCH_URL = os.getenv("MEILISEARCH_URL", "http://localhost:7700")
-    MEILISEARCH_MASTER_KEY = os.getenv("MEILISEARCH_MASTER_KEY", "")
-    
+    MEILISEARCH_URL: str = field(default_factory=lambda: os.getenv("MEILISEARCH_URL", "http://localhost:7700"))
+    MEILISEARCH_MASTER_KEY: str = field(default_factory=lambda: os.getenv("MEILISEARCH_MASTER_KEY", ""))
+
     # Application Configuration
-    DEBUG = os.getenv("DEBUG", "True").lower() == "true"
-    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
-    
+    DEBUG: bool = field(default_factory=lambda: os.getenv("DEBUG", "True").lower() == "true")
+    LOG_LEVEL: str = field(default_factory=lambda: os.getenv("LOG_LEVEL", "INFO"))
+
     # RAG Configuration
-    INDEX_NAME = "ecommerce_orders"
-    MAX_SEARCH_RESULTS = 5  # Reduced for faster processing
-    LLM_MODEL = "anthropic/claude-3-haiku"  # Faster model
-    
+    INDEX_NAME: str = "ecommerce_orders"
+    MAX_SEARCH_RESULTS: int = 5  # Reduced for faster processing
+    LLM_MODEL: str = "anthropic/claude-3-haiku"  # Faster model
+    INDEX_BATCH_BYTES: int = 5 * 1024 * 1024  # NDJSON payload per add-documents request
+
     # Data Configuration
-    DATA_FILE = "data/Order Details.csv"
-    
-    @classmethod
-    def validate_config(cls):
+    DATA_FILE: str = "data/Order Details.csv"
+    CSV_ENGINE: str = field(default_factory=lambda: os.getenv("CSV_ENGINE", "pandas"))  # pandas, arrow or polars
+
+    def validate_config(self):
         """Validate that required configuration is present"""
-        if not cls.OPENROUTER_API_KEY:
+        if not self.OPENROUTER_API_KEY:
             raise ValueError(
                 "OPENROUTER_API_KEY is required. Please set it in your .env file. "
                 "Get your API key from: https://openrouter.ai/keys"
             )
-        
-        return True 
\ No newline at end of file
+
+        return True
+
+Config = Settings()
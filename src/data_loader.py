@@ -1,12 +1,72 @@
-import pandas as pd
+from __future__ import annotations
+
+import numpy as np
 import json
-from typing import List, Dict, Any
+from typing import TYPE_CHECKING, Iterator, List, Dict, Any
 import logging
 
 from config import Config
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 logger = logging.getLogger(__name__)
 
+# Compact column types for the order CSV: repeated labels become categoricals and
+# quantities fit in int32; money columns stay float64 so stored amounts are exact
+_CSV_DTYPES = {
+    "Order ID": "string",
+    "Amount": "float64",
+    "Profit": "float64",
+    "Quantity": "int32",
+    "Category": "category",
+    "Sub-Category": "category"
+}
+
+# Bucket edges for the column-wise transform; np.searchsorted maps each value to
+# an integer code that indexes the label arrays below
+_AMOUNT_EDGES = np.array([100, 500])  # < 100, < 500, >= 500
+_PROFIT_EDGES = np.array([0, 50])  # < 0, < 50, >= 50
+_QUANTITY_EDGES = np.array([2, 5])  # <= 2, <= 5, > 5
+
+_AMOUNT_RANGES = np.array(["low", "medium", "high"])
+_PROFIT_RANGES = np.array(["loss", "low_profit", "high_profit"])
+_QUANTITY_RANGES = np.array(["small", "medium", "large"])
+_PRICE_DESCRIPTIONS = np.array(["affordable", "mid-range", "premium"])
+_QUALITY_DESCRIPTIONS = np.array(["good value", "high quality", "luxury"])
+_AVAILABILITY_DESCRIPTIONS = np.array(["Limited stock available", "Moderate availability", "Good stock availability"])
+
+def _arrow_convert_options():
+    """pyarrow CSV convert options matching _CSV_DTYPES"""
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+    
+    return pa_csv.ConvertOptions(column_types={
+        "Order ID": pa.string(),
+        "Amount": pa.float64(),
+        "Profit": pa.float64(),
+        "Quantity": pa.int32(),
+        "Category": pa.dictionary(pa.int32(), pa.string()),
+        "Sub-Category": pa.dictionary(pa.int32(), pa.string())
+    })
+
+def _polars_schema_overrides() -> Dict[str, Any]:
+    """polars CSV schema overrides matching _CSV_DTYPES"""
+    import polars as pl
+    
+    return {
+        "Order ID": pl.Utf8,
+        "Amount": pl.Float64,
+        "Profit": pl.Float64,
+        "Quantity": pl.Int32,
+        "Category": pl.Categorical,
+        "Sub-Category": pl.Categorical
+    }
+
+def _format_money(values: np.ndarray) -> List[str]:
+    """Format currency values with two decimals, exactly as ``"%.2f" % value`` does"""
+    return list(map("{:.2f}".format, values.tolist()))
+
 class EcommerceDataLoader:
     """Load and process e-commerce order data for RAG system"""
     
@@ -15,11 +75,32 @@ class EcommerceDataLoader:
         self.data_file = data_file or Config.DATA_FILE
         self.data = None
         
-    def load_data(self) -> pd.DataFrame:
-        """Load CSV data into a pandas DataFrame"""
+    def load_data(self, engine: str = None) -> pd.DataFrame:
+        """Load CSV data into a pandas DataFrame using the pandas, arrow or polars CSV reader"""
         try:
-            logger.info(f"Loading data from file: {self.data_file}")
-            self.data = pd.read_csv(self.data_file)
+            import pandas as pd
+            
+            engine = engine or Config.CSV_ENGINE
+            logger.info(f"Loading data from file: {self.data_file} (engine: {engine})")
+
+            if engine == "arrow":
+                from pyarrow import csv as pa_csv
+
+                table = pa_csv.read_csv(
+                    self.data_file,
+                    read_options=pa_csv.ReadOptions(block_size=8 << 20),
+                    convert_options=_arrow_convert_options()
+                )
+                self.data = table.to_pandas(split_blocks=True, self_destruct=True)
+            elif engine == "polars":
+                import polars as pl
+
+                self.data = pl.read_csv(self.data_file, schema_overrides=_polars_schema_overrides()).to_pandas()
+            elif engine == "pandas":
+                self.data = pd.read_csv(self.data_file, dtype=_CSV_DTYPES)
+            else:
+                raise ValueError(f"Unsupported CSV engine: {engine}. Use 'pandas', 'arrow' or 'polars'")
+
             logger.info(f"Successfully loaded {len(self.data)} rows from CSV file")
             logger.info(f"Data columns: {list(self.data.columns)}")
             return self.data
@@ -39,125 +120,134 @@ class EcommerceDataLoader:
             logger.info("Data not loaded, loading data first")
             self.load_data()
         
-        documents = []
         logger.info(f"Processing {len(self.data)} rows into documents")
-        
-        for index, row in self.data.iterrows():
-            doc = {
-                "id": f"order_{index}",
-                "order_id": str(row["Order ID"]),
-                "amount": float(row["Amount"]),
-                "profit": float(row["Profit"]),
-                "quantity": int(row["Quantity"]),
-                "category": str(row["Category"]),
-                "sub_category": str(row["Sub-Category"]),
-                "content": self._create_consumer_friendly_content(row),
-                "business_content": self._create_business_content(row),
-                "amount_range": self._get_amount_range(row["Amount"]),
-                "profit_range": self._get_profit_range(row["Profit"]),
-                "quantity_range": self._get_quantity_range(row["Quantity"])
-            }
-            documents.append(doc)
+        documents = self._build_documents(self.data)
         
         logger.info(f"Successfully processed {len(documents)} documents")
         logger.info(f"Sample document ID: {documents[0]['id'] if documents else 'None'}")
         
         return documents
     
-    def _create_consumer_friendly_content(self, row: pd.Series) -> str:
-        """Create consumer-friendly content without business metrics"""
-        product_name = str(row['Sub-Category'])
-        category = str(row['Category'])
-        amount = float(row['Amount'])
-        quantity = int(row['Quantity'])
-        
-        price_description = self._get_consumer_price_description(amount)
-        quality_description = self._get_consumer_quality_description(amount)
-        availability_description = self._get_consumer_availability_description(quantity)
+    def iter_document_batches(self, chunksize: int = 10_000, engine: str = None) -> Iterator[List[Dict[str, Any]]]:
+        """Stream the CSV in chunks with the pandas, arrow or polars reader and yield the documents built from each chunk"""
+        engine = engine or Config.CSV_ENGINE
+        logger.info(f"Streaming data from file: {self.data_file} in chunks of {chunksize} rows (engine: {engine})")
         
-        return f"Product: {product_name} from {category} category. Price: ${amount:.2f}, Quantity available: {quantity}. This is a {price_description} item with {quality_description} quality. {availability_description}."
+        for chunk in self._iter_chunks(chunksize, engine):
+            yield self._build_documents(chunk)
     
-    def _create_business_content(self, row: pd.Series) -> str:
-        """Create business-focused content with profit metrics"""
-        product_name = str(row['Sub-Category'])
-        category = str(row['Category'])
-        amount = float(row['Amount'])
-        profit = float(row['Profit'])
-        quantity = int(row['Quantity'])
-        if profit > 0:
-            profit_status = f"PROFIT of ${profit:.2f}"
-        elif profit < 0:
-            profit_status = f"LOSS of ${abs(profit):.2f}"
-        else:
-            profit_status = "BREAK-EVEN (no profit/loss)"
-
-        amount_range = self._get_amount_range(amount)
-
-        return f"Product: {product_name} from {category} category. Revenue: ${amount:.2f}, {profit_status}, Quantity: {quantity}. This is a {amount_range}-priced item."
+    def _iter_chunks(self, chunksize: int, engine: str) -> Iterator[pd.DataFrame]:
+        """Yield the CSV as pandas DataFrames of at most chunksize rows, indexed by row number"""
+        import pandas as pd
+        
+        if engine == "arrow":
+            from pyarrow import csv as pa_csv
             
-    def _get_consumer_price_description(self, amount: float) -> str:
-        """Get consumer-friendly price description"""
-        if amount < 100:
-            return "affordable"
-        elif amount < 500:
-            return "mid-range"
-        else:
-            return "premium"
-    
-    def _get_consumer_quality_description(self, amount: float) -> str:
-        """Get consumer-friendly quality description based on price"""
-        if amount < 100:
-            return "good value"
-        elif amount < 500:
-            return "high quality"
-        else:
-            return "luxury"
-    
-    def _get_consumer_availability_description(self, quantity: int) -> str:
-        """Get consumer-friendly availability description"""
-        if quantity <= 2:
-            return "Limited stock available"
-        elif quantity <= 5:
-            return "Moderate availability"
-        else:
-            return "Good stock availability"
-    
-    def _get_amount_range(self, amount: float) -> str:
-        """Categorize amount into ranges"""
-        if amount < 100:
-            return "low"
-        elif amount < 500:
-            return "medium"
-        else:
-            return "high"
-    
-    def _get_profit_range(self, profit: float) -> str:
-        """Categorize profit into ranges"""
-        if profit < 0:
-            return "loss"
-        elif profit < 50:
-            return "low_profit"
-        else:
-            return "high_profit"
-    
-    def _get_quantity_range(self, quantity: int) -> str:
-        """Categorize quantity into ranges"""
-        if quantity <= 2:
-            return "small"
-        elif quantity <= 5:
-            return "medium"
+            offset = 0
+            with pa_csv.open_csv(
+                self.data_file,
+                read_options=pa_csv.ReadOptions(block_size=8 << 20),
+                convert_options=_arrow_convert_options()
+            ) as reader:
+                for batch in reader:
+                    for start in range(0, batch.num_rows, chunksize):
+                        chunk = batch.slice(start, chunksize).to_pandas()
+                        chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+                        offset += len(chunk)
+                        yield chunk
+        elif engine == "polars":
+            import polars as pl
+            
+            offset = 0
+            for batch in self._iter_polars_batches(chunksize):
+                for frame in batch.iter_slices(chunksize):
+                    chunk = frame.to_pandas()
+                    chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+                    offset += len(chunk)
+                    yield chunk
+        elif engine == "pandas":
+            with pd.read_csv(self.data_file, dtype=_CSV_DTYPES, chunksize=chunksize) as reader:
+                yield from reader
         else:
-            return "large"
+            raise ValueError(f"Unsupported CSV engine: {engine}. Use 'pandas', 'arrow' or 'polars'")
     
-    def _get_profit_description(self, profit: float) -> str:
-        """Get a neutral description of profit status"""
-        if profit > 0:
-            return "positive profitability"
-        elif profit < 0:
-            return "negative profitability"
-        else:
-            return "break-even"
+    def _iter_polars_batches(self, chunksize: int) -> Iterator[Any]:
+        """Read the CSV with polars in batches, without loading the whole file"""
+        import polars as pl
+        
+        schema_overrides = _polars_schema_overrides()
+        lazy_frame = pl.scan_csv(self.data_file, schema_overrides=schema_overrides)
+        if hasattr(lazy_frame, "collect_batches"):
+            yield from lazy_frame.collect_batches(chunk_size=chunksize)
+            return
+        
+        # polars releases before LazyFrame.collect_batches
+        reader = pl.read_csv_batched(self.data_file, schema_overrides=schema_overrides, batch_size=chunksize)
+        batches = reader.next_batches(1)
+        while batches:
+            yield from batches
+            batches = reader.next_batches(1)
     
+    def _build_documents(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+        """Convert a DataFrame of orders into documents using column-wise operations"""
+        import pandas as pd
+        
+        amount = df["Amount"].to_numpy(float)
+        profit = df["Profit"].to_numpy(float)
+        quantity = df["Quantity"].to_numpy(int)
+
+        amount_code = np.searchsorted(_AMOUNT_EDGES, amount, side="right")
+        profit_code = np.searchsorted(_PROFIT_EDGES, profit, side="right")
+        quantity_code = np.searchsorted(_QUANTITY_EDGES, quantity, side="left")
+
+        amount_range = _AMOUNT_RANGES[amount_code]
+        profit_range = _PROFIT_RANGES[profit_code]
+        quantity_range = _QUANTITY_RANGES[quantity_code]
+
+        price_description = _PRICE_DESCRIPTIONS[amount_code]
+        quality_description = _QUALITY_DESCRIPTIONS[amount_code]
+        availability_description = _AVAILABILITY_DESCRIPTIONS[quantity_code]
+
+        amount_str = pd.Series(_format_money(amount), index=df.index)
+        abs_profit_str = pd.Series(_format_money(np.abs(profit)), index=df.index)
+        quantity_str = pd.Series(quantity.astype(str), index=df.index)
+        profit_status = pd.Series(
+            np.select([profit > 0, profit < 0], ["PROFIT of $", "LOSS of $"], default=""),
+            index=df.index
+        )
+        profit_status = profit_status.where(profit != 0, "BREAK-EVEN (no profit/loss)") + abs_profit_str.where(profit != 0, "")
+
+        category = df["Category"].astype(str)
+        sub_category = df["Sub-Category"].astype(str)
+        product = "Product: " + sub_category + " from " + category + " category. "
+
+        content = (
+            product + "Price: $" + amount_str + ", Quantity available: " + quantity_str
+            + ". This is a " + price_description + " item with " + quality_description
+            + " quality. " + availability_description + "."
+        )
+        business_content = (
+            product + "Revenue: $" + amount_str + ", " + profit_status + ", Quantity: " + quantity_str
+            + ". This is a " + amount_range + "-priced item."
+        )
+
+        columns = {
+            "id": ("order_" + df.index.astype(str)).tolist(),
+            "order_id": df["Order ID"].astype(str).tolist(),
+            "amount": amount.tolist(),
+            "profit": profit.tolist(),
+            "quantity": quantity.tolist(),
+            "category": category.tolist(),
+            "sub_category": sub_category.tolist(),
+            "content": content.tolist(),
+            "business_content": business_content.tolist(),
+            "amount_range": amount_range.tolist(),
+            "profit_range": profit_range.tolist(),
+            "quantity_range": quantity_range.tolist()
+        }
+        fields = tuple(columns)
+        return [dict(zip(fields, values)) for values in zip(*columns.values())]
+
 if __name__ == "__main__":
     loader = EcommerceDataLoader()
     documents = loader.process_data()
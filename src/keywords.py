@@ -0,0 +1,44 @@
+import re
+from typing import Callable, Iterable
+
+# Keywords that mark a query as personal shopping
+PERSONAL_KEYWORDS = frozenset({
+    'shopping', 'buy', 'buying', 'purchase', 'purchasing',
+    'gift', 'gifts', 'present', 'presents', 'souvenir', 'souvenirs',
+    'vacation', 'travel', 'trip', 'holiday', 'goa', 'beach',
+    'personal', 'family', 'friends', 'myself', 'me',
+    'recommend', 'recommendation', 'suggest', 'suggestion',
+    'what to buy', 'what should i buy', 'what can i take',
+    'need', 'want', 'looking for', 'searching for'
+})
+
+# Keywords that mark a query as business analysis
+BUSINESS_KEYWORDS = frozenset({
+    'business', 'profit', 'profitability', 'revenue', 'loss',
+    'margin', 'margins', 'analysis', 'analytics', 'performance',
+    'inventory', 'stock', 'quarterly', 'annual', 'strategy',
+    'management', 'optimization', 'efficiency', 'roi'
+})
+
+# Additional business phrasing recognised by the RAG system's context detection
+RANKING_KEYWORDS = frozenset({
+    'highest', 'best', 'top', 'most profitable', 'profit margins',
+    'financial', 'commercial', 'enterprise', 'corporate'
+})
+
+def keyword_counter(keywords: Iterable[str]) -> Callable[[str], int]:
+    """Build a function counting how many keywords occur in a text as substrings
+    
+    Equivalent to ``sum(keyword in text for keyword in keywords)`` in a single regex
+    scan: a lookahead alternation (longest first) finds the longest keyword starting
+    at each position, and every keyword contained in a found one is counted once.
+    """
+    keywords = frozenset(keywords)
+    alternation = "|".join(map(re.escape, sorted(keywords, key=len, reverse=True)))
+    pattern = re.compile(rf"(?=({alternation}))")
+    contained = {keyword: frozenset(other for other in keywords if other in keyword) for keyword in keywords}
+    
+    def count(text: str) -> int:
+        return len(frozenset().union(*(contained[match] for match in set(pattern.findall(text)))))
+    
+    return count
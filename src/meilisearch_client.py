@@ -1,12 +1,67 @@
-
-import meilisearch
 import logging
-from typing import List, Dict, Any
-import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, List, Dict, Any, Tuple
+import orjson
 
 from config import Config
 logger = logging.getLogger(__name__)
 
+# Categories in filter precedence order; keywords match as substrings ('furnitures',
+# 'cheapest'), and the lookahead scans report overlapping matches too
+_CATEGORIES = ('electronics', 'furniture', 'clothing')
+_CATEGORY_RE = re.compile(r"(?=(" + "|".join(_CATEGORIES) + r"))", re.IGNORECASE)
+
+# Price filters in precedence order, each with the keywords that select it
+_PRICE_FILTER_KEYWORDS = (
+    ('amount < 100', ('cheap', 'affordable', 'budget', 'low')),
+    ('amount >= 500', ('expensive', 'luxury', 'premium', 'high')),
+    ('amount >= 100 AND amount < 500', ('mid', 'medium'))
+)
+_PRICE_FILTERS = tuple(price_filter for price_filter, _ in _PRICE_FILTER_KEYWORDS)
+_PRICE_KEYWORD_FILTERS = {
+    keyword: price_filter
+    for price_filter, keywords in _PRICE_FILTER_KEYWORDS
+    for keyword in keywords
+}
+_PRICE_RE = re.compile(r"(?=(" + "|".join(_PRICE_KEYWORD_FILTERS) + r"))", re.IGNORECASE)
+
+def _ndjson_batches(documents: Iterable[Dict[str, Any]], max_bytes: int) -> Iterator[Tuple[bytes, int]]:
+    """Encode documents as NDJSON and yield (body, document_count) batches of about max_bytes each"""
+    lines = []
+    size = 0
+    for document in documents:
+        line = orjson.dumps(document)
+        lines.append(line)
+        size += len(line) + 1
+        if size >= max_bytes:
+            yield b"\n".join(lines), len(lines)
+            lines = []
+            size = 0
+    if lines:
+        yield b"\n".join(lines), len(lines)
+
+def _route_through_session(owner: Any, session: Any) -> None:
+    """Send an SDK object's HTTP calls through a pooled requests.Session
+    
+    The SDK calls module-level requests.get/post/..., which opens a new connection
+    per request; the session method of the same name reuses pooled keep-alive ones.
+    This hooks SDK internals (``http`` and ``task_handler.http``), so anything missing
+    is left alone and keeps the SDK's default transport.
+    """
+    task_handler = getattr(owner, 'task_handler', None)
+    for http in (getattr(owner, 'http', None), getattr(task_handler, 'http', None)):
+        send_request = getattr(http, 'send_request', None)
+        if send_request is None:
+            logger.debug("No SDK send_request hook on %r, using the default transport", owner)
+            continue
+        
+        def pooled_send_request(http_method, *args, send_request=send_request, **kwargs):
+            session_method = getattr(session, getattr(http_method, '__name__', ''), None)
+            return send_request(session_method or http_method, *args, **kwargs)
+        
+        http.send_request = pooled_send_request
+
 class MeilisearchClient:
     """Client for interacting with Meilisearch"""
     
@@ -16,6 +71,12 @@ class MeilisearchClient:
         self.url = url or Config.MEILISEARCH_URL
         self.master_key = master_key or Config.MEILISEARCH_MASTER_KEY
 
+        # Imported here so importing this module stays cheap until a client is created
+        import meilisearch
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
         logger.info(f"Connecting to Meilisearch at: {self.url}")
         if self.master_key:
             logger.info("Using master key for authentication")
@@ -24,11 +85,28 @@ class MeilisearchClient:
             logger.info("Connecting without master key")
             self.client = meilisearch.Client(self.url)
         
+        # One keep-alive connection pool shared by every request to the server
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=Retry(total=2, backoff_factor=0.1))
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        _route_through_session(self.client, self._session)
+        
         self.index_name = Config.INDEX_NAME
         logger.info(f"Using index name: {self.index_name}")
         self.index = None
+        
+        # Runs searches concurrently (capped) when the server has no /multi-search endpoint
+        self._search_pool = ThreadPoolExecutor(max_workers=8)
+        self._multi_search_supported = True
         logger.info("Meilisearch client initialized successfully")
         
+    def _get_index(self):
+        """Return a handle to the index whose requests share the client's connection pool"""
+        index = self.client.index(self.index_name)
+        _route_through_session(index, self._session)
+        return index
+    
     def create_index(self) -> bool:
         """Create the index if it doesn't exist"""
         try:
@@ -41,7 +119,7 @@ class MeilisearchClient:
                 }
             )
             
-            self.index = self.client.index(self.index_name)
+            self.index = self._get_index()
             
             logger.info(f"Index '{self.index_name}' created successfully")
             return True
@@ -49,7 +127,7 @@ class MeilisearchClient:
         except Exception as e:
             if "already exists" in str(e).lower():
                 logger.info(f"Index '{self.index_name}' already exists")
-                self.index = self.client.index(self.index_name)
+                self.index = self._get_index()
                 return True
             else:
                 logger.error(f"Error creating index: {e}")
@@ -69,37 +147,42 @@ class MeilisearchClient:
     def get_or_create_index(self):
         """Get existing index or create new one"""
         try:
-            self.index = self.client.index(self.index_name)
+            self.index = self._get_index()
         except Exception:
             self.create_index()
     
-    def add_documents(self, documents: List[Dict[str, Any]]) -> bool:
-        """Add documents to the index"""
+    def add_documents(self, documents: Iterable[Dict[str, Any]]) -> bool:
+        """Add documents to the index as orjson-encoded NDJSON batches
+        
+        Accepts any iterable, so a generator of documents is sent batch by batch
+        without materializing the whole corpus in memory. Batches are sized by
+        encoded payload (Config.INDEX_BATCH_BYTES) rather than document count.
+        """
         try:
-            logger.info(f"Adding {len(documents)} documents to index")
+            logger.info("Adding documents to index")
+            
+            from meilisearch.errors import MeilisearchTimeoutError
             
             if not self.index:
                 self.get_or_create_index()
             
-            batch_size = 100 
-            for i in range(0, len(documents), batch_size):
-                batch = documents[i:i + batch_size]
-                self.index.add_documents(batch)
-                import time
-                time.sleep(0.1)
+            task_uids = []
+            total_documents = 0
+            for body, count in _ndjson_batches(documents, Config.INDEX_BATCH_BYTES):
+                task = self.index.add_documents_ndjson(body)
+                task_uids.append(task.task_uid)
+                total_documents += count
             
-            logger.info("All batches added, waiting for indexing to complete")
-        
-            import time
-            max_wait = 30 
-            wait_time = 0
-            while wait_time < max_wait:
-                stats = self.get_index_stats()
-                if not stats.get('isIndexing', False):
-                    logger.info(f"Indexing completed after {wait_time} seconds")
-                    break
-                time.sleep(1)
-                wait_time += 1
+            logger.info("All %d documents added, waiting for indexing to complete", total_documents)
+            
+            try:
+                for task_uid in task_uids:
+                    task = self.client.wait_for_task(task_uid, timeout_in_ms=30000, interval_in_ms=50)
+                    if task.status == 'failed':
+                        logger.error(f"Indexing task {task_uid} failed: {task.error}")
+                logger.info("Indexing completed")
+            except MeilisearchTimeoutError:
+                logger.warning("Timed out waiting for indexing to complete")
             
             return True
             
@@ -173,8 +256,7 @@ class MeilisearchClient:
             
             results = self.index.search(query, opt_params)
             
-            logger.info(f"Search completed - found {len(results.get('hits', []))} results")
-            logger.info(f"Search processing time: {results.get('processingTimeMs', 0)}ms")
+            logger.info("Search completed - found %d results in %sms", len(results.get('hits', [])), results.get('processingTimeMs', 0))
             
             return results
             
@@ -182,6 +264,55 @@ class MeilisearchClient:
             logger.error(f"Error searching: {e}")
             raise
     
+    def multi_search(self, queries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Run several searches against the index in a single /multi-search request
+        
+        Each query is a dict of search parameters (``q``, ``limit``, ``filter``, ...);
+        results are returned in the same order as the queries. Servers without
+        /multi-search (before v1.1) get the searches concurrently from a thread pool.
+        """
+        try:
+            from meilisearch.errors import MeilisearchApiError
+            
+            searches = [
+                {
+                    'indexUid': self.index_name,
+                    'limit': 20,
+                    'attributesToRetrieve': ['id', 'content', 'business_content', 'category', 'sub_category', 'amount', 'profit', 'quantity'],
+                    'attributesToHighlight': ['category', 'sub_category', 'content'],
+                    **query
+                }
+                for query in queries
+            ]
+            
+            results = None
+            if self._multi_search_supported:
+                try:
+                    # Pre-encoded with orjson; the SDK sends bytes bodies as-is instead of running json.dumps
+                    body = orjson.dumps({'queries': searches})
+                    results = self.client.http.post(self.client.config.paths.multi_search, body).get('results', [])
+                except MeilisearchApiError as e:
+                    if e.status_code != 404:
+                        raise
+                    logger.warning("Meilisearch has no /multi-search endpoint, falling back to concurrent searches")
+                    self._multi_search_supported = False
+            
+            if results is None:
+                if not self.index:
+                    self.get_or_create_index()
+                results = list(self._search_pool.map(
+                    lambda search: self.index.search(search['q'], {k: v for k, v in search.items() if k not in ('indexUid', 'q')}),
+                    searches
+                ))
+            
+            logger.info("Multi-search completed - %d queries, %d total results", len(results), sum(len(result.get('hits', [])) for result in results))
+            
+            return results
+            
+        except Exception as e:
+            logger.error(f"Error in multi-search: {e}")
+            raise
+    
     def search_by_category(self, query: str, limit: int = None) -> Dict[str, Any]:
         """Search documents by category with enhanced relevance"""
         try:
@@ -195,19 +326,15 @@ class MeilisearchClient:
                 'attributesToCrop': ['content']
             }
             
-            if any(cat.lower() in query.lower() for cat in ['electronics', 'furniture', 'clothing']):
-                category_filter = None
-                for cat in ['electronics', 'furniture', 'clothing']:
-                    if cat.lower() in query.lower():
-                        category_filter = f"category = '{cat}'"
-                        break
-                
-                if category_filter:
-                    opt_params['filter'] = category_filter
+            categories = {category.lower() for category in _CATEGORY_RE.findall(query)}
+            for category in _CATEGORIES:
+                if category in categories:
+                    opt_params['filter'] = f"category = '{category}'"
+                    break
             
             results = self.index.search(query, opt_params)
             
-            logger.info(f"Category search completed - found {len(results.get('hits', []))} results")
+            logger.info("Category search completed - found %d results", len(results.get('hits', [])))
             return results
             
         except Exception as e:
@@ -226,16 +353,15 @@ class MeilisearchClient:
                 'sort': ['amount:asc']
             }
             
-            if any(word in query.lower() for word in ['cheap', 'affordable', 'budget', 'low']):
-                opt_params['filter'] = 'amount < 100'
-            elif any(word in query.lower() for word in ['expensive', 'luxury', 'premium', 'high']):
-                opt_params['filter'] = 'amount >= 500'
-            elif any(word in query.lower() for word in ['mid', 'medium']):
-                opt_params['filter'] = 'amount >= 100 AND amount < 500'
+            price_filters = {_PRICE_KEYWORD_FILTERS[word.lower()] for word in _PRICE_RE.findall(query)}
+            for price_filter in _PRICE_FILTERS:
+                if price_filter in price_filters:
+                    opt_params['filter'] = price_filter
+                    break
             
             results = self.index.search(query, opt_params)
             
-            logger.info(f"Price range search completed - found {len(results.get('hits', []))} results")
+            logger.info("Price range search completed - found %d results", len(results.get('hits', [])))
             return results
             
         except Exception as e:
@@ -256,9 +382,9 @@ class MeilisearchClient:
                 serializable_stats = {}
                 for key, value in stats.__dict__.items():
                     try:
-                        json.dumps(value)
+                        orjson.dumps(value)
                         serializable_stats[key] = value
-                    except (TypeError, ValueError):
+                    except TypeError:
                         serializable_stats[key] = str(value)
                 return serializable_stats
             else:
@@ -298,6 +424,6 @@ if __name__ == "__main__":
         client.configure_search_settings()
         
         stats = client.get_index_stats()
-        print(f"Index stats: {json.dumps(stats, indent=2)}")
+        print(f"Index stats: {orjson.dumps(stats, option=orjson.OPT_INDENT_2).decode()}")
     else:
         print("Meilisearch is not running. Please start it first.") 
\ No newline at end of file
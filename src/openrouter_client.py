@@ -1,13 +1,21 @@
+import asyncio
+import importlib.util
 import logging
-from typing import Dict, Any, List
-from openai import OpenAI
-from openai.types.chat import ChatCompletion
+from functools import lru_cache
+from operator import itemgetter
+from typing import Dict, Any, Iterator, List
 
 from config import Config
+from keywords import BUSINESS_KEYWORDS, PERSONAL_KEYWORDS, keyword_counter
 from prompts import E_COMMERCE_SYSTEM_PROMPT, RAG_USER_PROMPT_TEMPLATE
 
 logger = logging.getLogger(__name__)
 
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_count_personal = keyword_counter(PERSONAL_KEYWORDS)
+_count_business = keyword_counter(BUSINESS_KEYWORDS)
+
 class OpenRouterClient:
     """Client for interacting with OpenRouter API"""
     
@@ -23,16 +31,50 @@ class OpenRouterClient:
         
         logger.info(f"Using OpenRouter base URL: {self.base_url}")
         
+        self.default_headers = {
+            "HTTP-Referer": "https://agentic-rag-system.com",
+            "X-Title": "Agentic RAG System",
+            "anthropic-beta": "prompt-caching-2024-07-31"
+        }
+        # Imported here so modules that only build prompts don't pay for the SDK import
+        from openai import DefaultHttpxClient, OpenAI
+        
+        # Long-lived pooled client, multiplexed over HTTP/2 when h2 is installed
         self.client = OpenAI(
             api_key=self.api_key,
             base_url=self.base_url,
-            default_headers={
-                "HTTP-Referer": "https://agentic-rag-system.com",
-                "X-Title": "Agentic RAG System"
-            }
+            default_headers=self.default_headers,
+            http_client=DefaultHttpxClient(http2=_HTTP2_AVAILABLE)
         )
+        
+        # The async client's connections belong to the event loop that opened them,
+        # so it is created lazily per running loop (see _async_client)
+        self._aclient = None
+        self._aclient_loop = None
         logger.info("OpenRouter client initialized successfully")
     
+    def _async_client(self):
+        """Return the async client for the running event loop, creating it on first use"""
+        loop = asyncio.get_running_loop()
+        if self._aclient is None or self._aclient_loop is not loop:
+            from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+            
+            self._aclient = AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                default_headers=self.default_headers,
+                http_client=DefaultAsyncHttpxClient(http2=_HTTP2_AVAILABLE)
+            )
+            self._aclient_loop = loop
+        return self._aclient
+    
+    async def aclose(self):
+        """Close the async client opened in the running event loop, if any"""
+        if self._aclient is not None and self._aclient_loop is asyncio.get_running_loop():
+            await self._aclient.close()
+        self._aclient = None
+        self._aclient_loop = None
+    
     def generate_response(self, 
                          messages: List[Dict[str, str]], 
                          model: str = None,
@@ -42,7 +84,7 @@ class OpenRouterClient:
         try:
             model = model or Config.LLM_MODEL
             
-            logger.info(f"Generating response with model: {model}")
+            logger.info("Generating response with model: %s", model)
             
             response = self.client.chat.completions.create(
                 model=model,
@@ -69,26 +111,105 @@ class OpenRouterClient:
             logger.error(f"Error generating response: {e}")
             raise
     
-    def create_rag_prompt(self, query: str, context: List[Dict[str, Any]], is_personal_context: bool = None) -> List[Dict[str, str]]:
-        """Create a prompt for RAG system"""
-        logger.info(f"Creating RAG prompt for query: {query}")
-        logger.info(f"No. of context documents: {len(context)}")
+    def generate_response_stream(self, 
+                                 messages: List[Dict[str, str]], 
+                                 model: str = None,
+                                 temperature: float = 0.7,
+                                 max_tokens: int = 1000) -> Iterator[str]:
+        """Start a streaming completion and return an iterator over its content deltas
+        
+        The request is sent before this returns, so callers can do other work while
+        the first tokens are generated.
+        """
+        try:
+            model = model or Config.LLM_MODEL
+            
+            logger.info("Streaming response with model: %s", model)
+            
+            stream = self.client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                timeout=10.0,
+                stream=True
+            )
+            
+        except Exception as e:
+            logger.error(f"Error generating streaming response: {e}")
+            raise
+        
+        return (
+            chunk.choices[0].delta.content
+            for chunk in stream
+            if chunk.choices and chunk.choices[0].delta.content
+        )
+    
+    async def agenerate_response(self, 
+                                 messages: List[Dict[str, str]], 
+                                 model: str = None,
+                                 temperature: float = 0.7,
+                                 max_tokens: int = 1000) -> Dict[str, Any]:
+        """Generate response using OpenRouter API without blocking the event loop"""
+        try:
+            model = model or Config.LLM_MODEL
+            
+            logger.info("Generating async response with model: %s", model)
+            
+            response = await self._async_client().chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                timeout=10.0
+            )
+            
+            result = {
+                "choices": [
+                    {
+                        "message": {
+                            "content": response.choices[0].message.content
+                        }
+                    }
+                ]
+            }
+            
+            logger.info("Async response generated successfully")
+            return result
+            
+        except Exception as e:
+            logger.error(f"Error generating async response: {e}")
+            raise
+    
+    async def abatch(self, 
+                     messages_list: List[List[Dict[str, str]]], 
+                     **kwargs) -> List[Dict[str, Any]]:
+        """Generate responses for several prompts concurrently, preserving input order
+        
+        The async client is closed afterwards, so each call (e.g. each ``asyncio.run``)
+        gets fresh connections on its own event loop.
+        """
+        try:
+            return await asyncio.gather(*(self.agenerate_response(messages, **kwargs) for messages in messages_list))
+        finally:
+            await self.aclose()
+    
+    def create_rag_prompt(self, query: str, context: List[Dict[str, Any]], is_personal_context: bool = None) -> List[Dict[str, Any]]:
+        """Create a prompt for RAG system with the static system prompt marked for prompt caching"""
+        logger.info("Creating RAG prompt for query: %s (%d context documents)", query, len(context))
 
         if is_personal_context is None:
             is_personal_context = self._detect_personal_context(query)
 
-        logger.info(f"Using context: {'PERSONAL' if is_personal_context else 'BUSINESS'}")
+        logger.info("Using context: %s", 'PERSONAL' if is_personal_context else 'BUSINESS')
         
-        context_text = ""
-        for i, doc in enumerate(context, 1):
-            if is_personal_context:
-                content = doc.get('content', '')
-            else:
-                content = doc.get('business_content', doc.get('content', ''))
-            
-            context_text += f"{i}. {content}\n"
-        
-        logger.info(f"Context text length: {len(context_text)} characters")
+        content_key = 'content' if is_personal_context else 'business_content'
+        get_content = itemgetter(content_key)
+        try:
+            contents = [get_content(doc) for doc in context]
+        except KeyError:
+            contents = [doc.get(content_key, doc.get('content', '')) for doc in context]
+        context_text = "".join(f"{i}. {content}\n" for i, content in enumerate(contents, 1))
         
         user_prompt = RAG_USER_PROMPT_TEMPLATE.format(
             context_text=context_text,
@@ -96,38 +217,29 @@ class OpenRouterClient:
         )
 
         messages = [
-            {"role": "system", "content": E_COMMERCE_SYSTEM_PROMPT},
+            {
+                "role": "system",
+                "content": [
+                    {
+                        "type": "text",
+                        "text": E_COMMERCE_SYSTEM_PROMPT,
+                        "cache_control": {"type": "ephemeral"}
+                    }
+                ]
+            },
             {"role": "user", "content": user_prompt}
         ]
         
-        logger.info(f"Created prompt with {len(messages)} messages")
-        logger.info(f"Total prompt length: {len(str(messages))} characters")
-        
         return messages
     
-    def _detect_personal_context(self, query: str) -> bool:
-        """Automatically detect if the query is for personal shopping context"""
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _detect_personal_context(query: str) -> bool:
+        """Automatically detect if the query is for personal shopping context (memoized per query)"""
         query_lower = query.lower()
         
-        personal_keywords = [
-            'shopping', 'buy', 'buying', 'purchase', 'purchasing',
-            'gift', 'gifts', 'present', 'presents', 'souvenir', 'souvenirs',
-            'vacation', 'travel', 'trip', 'holiday', 'goa', 'beach',
-            'personal', 'family', 'friends', 'myself', 'me',
-            'recommend', 'recommendation', 'suggest', 'suggestion',
-            'what to buy', 'what should i buy', 'what can i take',
-            'need', 'want', 'looking for', 'searching for'
-        ]
-        
-        business_keywords = [
-            'business', 'profit', 'profitability', 'revenue', 'loss',
-            'margin', 'margins', 'analysis', 'analytics', 'performance',
-            'inventory', 'stock', 'quarterly', 'annual', 'strategy',
-            'management', 'optimization', 'efficiency', 'roi'
-        ]
-        
-        personal_matches = sum(1 for keyword in personal_keywords if keyword in query_lower)
-        business_matches = sum(1 for keyword in business_keywords if keyword in query_lower)
+        personal_matches = _count_personal(query_lower)
+        business_matches = _count_business(query_lower)
         
         if business_matches > personal_matches and business_matches > 0:
             return False
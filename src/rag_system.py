@@ -1,10 +1,21 @@
+import asyncio
+import hashlib
 import logging
+import re
+import threading
 import time
-from typing import Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
 import json
+from itertools import chain
+from types import MappingProxyType
+
+from cachetools import TTLCache
 
 from config import Config
 from data_loader import EcommerceDataLoader
+from keywords import BUSINESS_KEYWORDS, PERSONAL_KEYWORDS, RANKING_KEYWORDS, keyword_counter
 from meilisearch_client import MeilisearchClient
 from openrouter_client import OpenRouterClient
 
@@ -18,6 +29,80 @@ logging.getLogger('meilisearch_client').setLevel(logging.WARNING)
 logging.getLogger('data_loader').setLevel(logging.WARNING)
 logging.getLogger('openrouter_client').setLevel(logging.WARNING)
 
+_count_personal = keyword_counter(PERSONAL_KEYWORDS)
+_count_business = keyword_counter(BUSINESS_KEYWORDS | RANKING_KEYWORDS)
+
+# Keywords match as substrings of the query, so plural and compound forms
+# ('chairs', 'home office', 't-shirt') are covered by their stems below
+_CATEGORY_MAPPING = MappingProxyType({
+    'clothing': frozenset({'clothing', 'clothes', 'dress', 'shirt', 'trousers', 'saree', 'stole', 'kurti', 'hankerchief', 'gift', 'family', 'personal'}),
+    'furniture': frozenset({'furniture', 'chair', 'bookcase', 'table', 'desk', 'office', 'home'}),
+    'electronics': frozenset({'electronic', 'phone', 'printer', 'game', 'tech', 'gadget'})
+})
+_ALL_CATEGORIES = tuple(_CATEGORY_MAPPING)
+_CATEGORY_FILTER = MappingProxyType({category: f"category = '{category.title()}'" for category in _CATEGORY_MAPPING})
+
+# Terms tried, in order, when the main and category searches come back short; only
+# those that appear in the query are probed, alongside its longest other word
+_RELEVANT_TERMS = ('clothing', 'furniture', 'electronics', 'phone', 'chair', 'saree', 'stole', 'affordable', 'gift', 'office')
+_RELEVANT_TERMS_SET = frozenset(_RELEVANT_TERMS)
+_WORD_RE = re.compile(r"\w{3,}")
+
+# Single-pass category detection: one alternation over every keyword (longest first,
+# substring semantics like the original per-keyword `in` checks), mapped back to its category
+_CATEGORY_KEYWORDS = MappingProxyType({
+    keyword: category
+    for category, keywords in _CATEGORY_MAPPING.items()
+    for keyword in keywords
+})
+_CATEGORY_RE = re.compile("|".join(map(re.escape, sorted(_CATEGORY_KEYWORDS, key=len, reverse=True))))
+
+# Generation settings for RAG answers
+_LLM_TEMP = 0.3
+_LLM_MAX_TOKENS = 800
+
+_PUNCTUATION_RE = re.compile(r"[^\w\s]")
+
+def _normalize_query(query: str) -> str:
+    """Lowercase a query, strip punctuation and collapse whitespace for cache keys"""
+    return " ".join(_PUNCTUATION_RE.sub(" ", query.lower()).split())
+
+def _cache_key(*parts: Any) -> str:
+    """Build a fixed-size cache key from the given parts"""
+    return hashlib.sha256("|".join(map(str, parts)).encode()).hexdigest()
+
+def _merge_unique(hits: Iterable[Dict[str, Any]], limit: int) -> List[Dict[str, Any]]:
+    """Deduplicate hits by id in a single pass, keeping first-seen order, up to limit hits"""
+    merged = {}
+    for hit in hits:
+        if len(merged) >= limit:
+            break
+        merged.setdefault(hit.get('id'), hit)
+    return list(merged.values())
+
+def _copy_search_results(results: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of cached search results, so callers can't mutate the cached hit list"""
+    return {**results, 'hits': list(results['hits'])}
+
+def _copy_query_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of a cached query result, so callers can't mutate its context or sources"""
+    return {
+        **result,
+        "context": list(result["context"]),
+        "sources": [dict(source) for source in result["sources"]],
+        "search_stats": dict(result["search_stats"])
+    }
+
+def _format_profit(profit: Optional[float]) -> Optional[str]:
+    """Format a profit as a signed dollar amount: '+$x.xx', '-$x.xx' or '$0.00'"""
+    if profit is None:
+        return None
+    return f"{'+' if profit > 0 else '-' if profit < 0 else ''}${abs(profit):.2f}"
+
+def _no_profit(profit: Optional[float]) -> None:
+    """Profit formatter for personal context, where profit data is not shown"""
+    return None
+
 class AgenticRAGSystem:
     """Main RAG system for e-commerce data analysis"""
     
@@ -27,96 +112,92 @@ class AgenticRAGSystem:
         self.meilisearch_client = MeilisearchClient()
         self.openrouter_client = OpenRouterClient()
         
+        # Short-lived search results and longer-lived answers, keyed by normalized query
+        self._search_cache = TTLCache(maxsize=512, ttl=120)
+        self._query_cache = TTLCache(maxsize=256, ttl=3600)
+        # query_batch runs _smart_search in worker threads; TTLCache is not thread-safe
+        self._search_cache_lock = threading.Lock()
+        
+        # Component health for get_system_info, refreshed at most every 5 seconds
+        self._status_cache = TTLCache(maxsize=1, ttl=5)
+        self._status_pool = ThreadPoolExecutor(max_workers=2)
+        
         Config.validate_config()
     
     def _smart_search(self, query: str, max_results: int, filters: str = None) -> Dict[str, Any]:
-        """Perform smart search with improved relevance"""
+        """Perform smart search with improved relevance
+        
+        Runs in phases that each pass on a plain list of hits. A main search that
+        already fills max_results is returned straight away. Otherwise the
+        per-category and fallback-term searches are sent as one Meilisearch
+        multi-search request; only the broader searches for categories that came
+        back empty need a further (also batched) request.
+        """
+        cache_key = _cache_key(_normalize_query(query), max_results, filters)
+        with self._search_cache_lock:
+            cached_results = self._search_cache.get(cache_key)
+        if cached_results is not None:
+            logger.info("Search cache hit")
+            return _copy_search_results(cached_results)
+        
         try:
+            results = self.meilisearch_client.search(query, max_results, filters)
+            hits = results.get('hits') or []
+            logger.info("Initial search found: %d results", len(hits))
+            
+            if len(hits) >= max_results:
+                results.setdefault('estimatedTotalHits', len(hits))
+                results.setdefault('processingTimeMs', 0)
+                with self._search_cache_lock:
+                    self._search_cache[cache_key] = _copy_search_results(results)
+                return results
+            
             query_lower = query.lower()
             
-            results = self.meilisearch_client.search(query, max_results, filters)
-            logger.info(f"Initial search found: {len(results.get('hits', []))} results")
-            
-            if not results.get('hits') or len(results['hits']) < max_results:
-                logger.info("Insufficient results, doing category-based search...")
-                
-                category_mapping = {
-                    'clothing': ['clothing', 'clothes', 'dress', 'shirt', 'trousers', 'saree', 'stole', 'kurti', 'hankerchief', 't-shirt', 'shirt', 'gift', 'family', 'personal'],
-                    'furniture': ['furniture', 'chair', 'chairs', 'bookcase', 'bookcases', 'table', 'desk', 'home office', 'office', 'home'],
-                    'electronics': ['electronics', 'electronic', 'phone', 'phones', 'printer', 'printers', 'game', 'games', 'affordable electronics', 'tech', 'gadget']
-                }
-                
-                matching_categories = []
-                for category, keywords in category_mapping.items():
-                    if any(keyword in query_lower for keyword in keywords):
-                        matching_categories.append(category)
-                        logger.info(f"Query matches category: {category}")
-                
-                if not matching_categories:
-                    matching_categories = ['clothing', 'furniture', 'electronics']
-                    logger.info("No specific category detected, searching all categories")
-                
-                all_category_results = []
+            matched = {_CATEGORY_KEYWORDS[keyword] for keyword in _CATEGORY_RE.findall(query_lower)}
+            matching_categories = [category for category in _CATEGORY_MAPPING if category in matched]
+            if logger.isEnabledFor(logging.INFO):
                 for category in matching_categories:
-                    logger.info(f"Searching category: {category}")
-                    
-                    category_filter = f"category = '{category.title()}'"
-                    category_results = self.meilisearch_client.search(query, max_results * 2, category_filter)
-                    
-                    if category_results.get('hits'):
-                        logger.info(f"Category {category} found {len(category_results['hits'])} results")
-                        all_category_results.extend(category_results['hits'])
-                    else:
-                        broader_results = self.meilisearch_client.search(category, max_results, category_filter)
-                        if broader_results.get('hits'):
-                            logger.info(f"Broader search in {category} found {len(broader_results['hits'])} results")
-                            all_category_results.extend(broader_results['hits'])
-                
-                unique_results = []
-                seen_ids = set()
-                for hit in all_category_results:
-                    if hit.get('id') not in seen_ids:
-                        unique_results.append(hit)
-                        seen_ids.add(hit.get('id'))
-                        if len(unique_results) >= max_results:
-                            break
-                
-                if unique_results:
-                    results['hits'] = unique_results
-                    logger.info(f"Category search completed - found {len(unique_results)} unique results")
-                else:
-                    logger.warning("Category search found no results")
-            
-            if not results.get('hits') or len(results['hits']) < max_results:
-                logger.info("Doing final fallback search...")
-                
-                query_words = [word for word in query_lower.split() if len(word) > 2]
-                relevant_terms = ['clothing', 'furniture', 'electronics', 'phone', 'chair', 'saree', 'stole', 'affordable', 'gift', 'office']
-                
-                for term in relevant_terms + query_words:
-                    if len(results.get('hits', [])) >= max_results:
-                        break
-                    
-                    term_results = self.meilisearch_client.search(term, max_results - len(results.get('hits', [])))
-                    if term_results.get('hits'):
-                        if not results.get('hits'):
-                            results = term_results
-                        else:
-                            existing_ids = {hit.get('id') for hit in results['hits']}
-                            for hit in term_results['hits']:
-                                if hit.get('id') not in existing_ids and len(results['hits']) < max_results:
-                                    results['hits'].append(hit)
-                
-                logger.info(f"Fallback search completed - total results: {len(results.get('hits', []))}")
-            
-            if not results.get('hits'):
-                results['hits'] = []
-            if 'estimatedTotalHits' not in results:
-                results['estimatedTotalHits'] = len(results['hits'])
-            if 'processingTimeMs' not in results:
-                results['processingTimeMs'] = 0
-                
-            logger.info(f"Final search results: {len(results['hits'])} hits")
+                    logger.info("Query matches category: %s", category)
+            
+            if not matching_categories:
+                matching_categories = _ALL_CATEGORIES
+                logger.info("No specific category detected, searching all categories")
+            
+            tokens = set(_WORD_RE.findall(query_lower))
+            probes = [term for term in _RELEVANT_TERMS if term in tokens][:2]
+            probes.extend(sorted(tokens - _RELEVANT_TERMS_SET, key=lambda token: (-len(token), token))[:1])
+            
+            widen = max_results * 2
+            searches = [
+                {'q': query, 'limit': widen, 'filter': _CATEGORY_FILTER[category]}
+                for category in matching_categories
+            ]
+            searches.extend({'q': term, 'limit': max_results} for term in probes)
+            
+            responses = self.meilisearch_client.multi_search(searches)
+            
+            logger.info("Insufficient results, using category-based search...")
+            category_hits = self._category_hits(matching_categories, responses[:len(matching_categories)], max_results)
+            if category_hits:
+                hits = category_hits
+                logger.info("Category search completed - found %d unique results", len(hits))
+            else:
+                logger.warning("Category search found no results")
+            
+            if len(hits) < max_results:
+                logger.info("Using fallback term searches...")
+                term_hits = (term_results.get('hits') or [] for term_results in responses[len(matching_categories):])
+                hits = _merge_unique(chain(hits, *term_hits), max_results)
+                logger.info("Fallback search completed - total results: %d", len(hits))
+            
+            results['hits'] = hits
+            results.setdefault('estimatedTotalHits', len(hits))
+            results.setdefault('processingTimeMs', 0)
+            
+            logger.info("Final search results: %d hits", len(hits))
+            with self._search_cache_lock:
+                self._search_cache[cache_key] = _copy_search_results(results)
             return results
             
         except Exception as e:
@@ -127,31 +208,46 @@ class AgenticRAGSystem:
                 'processingTimeMs': 0
             }
     
-    def _detect_personal_context(self, query: str) -> bool:
-        """Automatically detect if the query is for personal shopping context"""
-        query_lower = query.lower()
-        
-        personal_keywords = [
-            'shopping', 'buy', 'buying', 'purchase', 'purchasing',
-            'gift', 'gifts', 'present', 'presents', 'souvenir', 'souvenirs',
-            'vacation', 'travel', 'trip', 'holiday', 'goa', 'beach',
-            'personal', 'family', 'friends', 'myself', 'me',
-            'recommend', 'recommendation', 'suggest', 'suggestion',
-            'what to buy', 'what should i buy', 'what can i take',
-            'need', 'want', 'looking for', 'searching for'
+    def _category_hits(self, 
+                       categories: Iterable[str], 
+                       category_responses: List[Dict[str, Any]], 
+                       max_results: int) -> List[Dict[str, Any]]:
+        """Merge per-category hits, retrying categories that came back empty with a broader search"""
+        empty_categories = [
+            category for category, category_results in zip(categories, category_responses)
+            if not category_results.get('hits')
         ]
+        broader_responses = {}
+        if empty_categories:
+            broader_responses = dict(zip(empty_categories, self.meilisearch_client.multi_search([
+                {'q': category, 'limit': max_results, 'filter': _CATEGORY_FILTER[category]}
+                for category in empty_categories
+            ])))
         
-        business_keywords = [
-            'business', 'profit', 'profitability', 'revenue', 'loss',
-            'margin', 'margins', 'analysis', 'analytics', 'performance',
-            'inventory', 'stock', 'quarterly', 'annual', 'strategy',
-            'management', 'optimization', 'efficiency', 'roi',
-            'highest', 'best', 'top', 'most profitable', 'profit margins',
-            'financial', 'commercial', 'enterprise', 'corporate'
-        ]
+        category_hits = []
+        for category, category_results in zip(categories, category_responses):
+            hits = category_results.get('hits')
+            if hits:
+                logger.info("Category %s found %d results", category, len(hits))
+            else:
+                hits = broader_responses.get(category, {}).get('hits')
+                if not hits:
+                    continue
+                logger.info("Broader search in %s found %d results", category, len(hits))
+            category_hits.append(hits)
         
-        personal_matches = sum(1 for keyword in personal_keywords if keyword in query_lower)
-        business_matches = sum(1 for keyword in business_keywords if keyword in query_lower)
+        return _merge_unique(chain.from_iterable(category_hits), max_results)
+    
+    def _detect_personal_context(self, query: str) -> bool:
+        """Automatically detect if the query is for personal shopping context"""
+        return self._detect_personal_context_cached(" ".join(query.lower().split()))
+    
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _detect_personal_context_cached(query_lower: str) -> bool:
+        """Context detection on a lowercased, whitespace-normalized query (memoized)"""
+        personal_matches = _count_personal(query_lower)
+        business_matches = _count_business(query_lower)
         
         if business_matches > personal_matches and business_matches > 0:
             return False
@@ -178,11 +274,14 @@ class AgenticRAGSystem:
             self.meilisearch_client.configure_search_settings()
             
             print("Loading data...")
-            documents = self.data_loader.process_data()
-            
-            logger.info(f"Adding {len(documents)} documents to index")
+            documents = chain.from_iterable(self.data_loader.iter_document_batches())
             self.meilisearch_client.add_documents(documents)
             
+            self._search_cache.clear()
+            self._query_cache.clear()
+            self._detect_personal_context_cached.cache_clear()
+            self._status_cache.clear()
+            
             print("System ready!")
             return True
             
@@ -193,93 +292,158 @@ class AgenticRAGSystem:
     
     def query(self, 
               user_query: str, 
-              max_results: int = None,
+              max_results: Optional[int] = Config.MAX_SEARCH_RESULTS,
               filters: str = None,
-              model: str = None) -> Dict[str, Any]:
-        """Process a user query using RAG"""
+              model: str = None,
+              stream: bool = False) -> Dict[str, Any]:
+        """Process a user query using RAG
+        
+        With ``stream=True`` the result is returned as soon as the LLM request is in
+        flight: ``answer_stream`` yields the answer as it is generated, and once it is
+        exhausted ``answer``, ``llm_time`` and ``total_time`` are filled in.
+        """
         try:
             start_time = time.time()
-            logger.info(f"Processing query: '{user_query}'")
+            logger.info("Processing query: '%s'", user_query)
             
-            search_results = self._smart_search(user_query, max_results or Config.MAX_SEARCH_RESULTS, filters)
+            if max_results is None:
+                max_results = Config.MAX_SEARCH_RESULTS
+            search_results = self._smart_search(user_query, max_results, filters)
             
             search_time = time.time() - start_time
             
             if not search_results['hits']:
-                logger.warning("No relevant documents found for query")
-                return {
-                    "query": user_query,
-                    "answer": "I couldn't find any relevant data to answer your question. Please try rephrasing your query.",
-                    "context": [],
-                    "search_time": search_time,
-                    "llm_time": 0.0,
-                    "total_time": time.time() - start_time,
-                    "sources": [],
-                    "search_stats": {
-                        "total_hits": 0,
-                        "processing_time_ms": 0
-                    }
-                }
+                result = self._no_results(user_query, search_time, start_time)
+                if stream:
+                    result["answer_stream"] = iter([result["answer"]])
+                return result
+            
+            context_docs = search_results['hits']
+            
+            query_key = self._query_key(user_query, model, context_docs)
+            cached_result = self._query_cache.get(query_key)
+            if cached_result is not None:
+                result = self._from_cache(cached_result, user_query, search_time, start_time)
+                if stream:
+                    result["answer_stream"] = iter([result["answer"]])
+                return result
+            
+            is_personal_context = self._detect_personal_context(user_query)
+            messages = self.openrouter_client.create_rag_prompt(user_query, context_docs, is_personal_context)
+            
+            llm_start_time = time.time()
+            if stream:
+                # Request is sent here; sources are built while the first tokens are generated
+                answer_stream = self.openrouter_client.generate_response_stream(
+                    messages=messages,
+                    model=model,
+                    temperature=_LLM_TEMP,
+                    max_tokens=_LLM_MAX_TOKENS
+                )
+                answer = ""
+                llm_time = 0.0
+            else:
+                llm_response = self.openrouter_client.generate_response(
+                    messages=messages,
+                    model=model,
+                    temperature=_LLM_TEMP,
+                    max_tokens=_LLM_MAX_TOKENS
+                )
+                llm_time = time.time() - llm_start_time
+                answer = llm_response['choices'][0]['message']['content']
+            
+            total_time = time.time() - start_time
+            
+            result = self._build_result(
+                user_query, answer, context_docs, is_personal_context, search_results,
+                search_time, llm_time, total_time
+            )
+            
+            if stream:
+                result["answer_stream"] = self._stream_answer(answer_stream, result, query_key, start_time, llm_start_time)
+                return result
+            
+            self._query_cache[query_key] = _copy_query_result(result)
+            
+            logger.info("Query completed in %.2fs (search: %.2fs, LLM: %.2fs)", total_time, search_time, llm_time)
+            
+            return result
+            
+        except Exception as e:
+            logger.error(f"Error processing query: {e}")
+            raise
+    
+    async def query_batch(self, 
+                          queries: List[str], 
+                          max_results: Optional[int] = Config.MAX_SEARCH_RESULTS,
+                          filters: str = None,
+                          model: str = None) -> List[Dict[str, Any]]:
+        """Process several queries concurrently, returning results in input order
+        
+        Searches run in worker threads and the LLM calls go out together through the
+        async OpenRouter client, so a batch takes about as long as its slowest query.
+        That client belongs to the running event loop and is closed once the batch is
+        done, so every ``asyncio.run(query_batch(...))`` starts with fresh connections.
+        """
+        try:
+            return await asyncio.gather(*(
+                self._query_async(user_query, max_results, filters, model)
+                for user_query in queries
+            ))
+        finally:
+            await self.openrouter_client.aclose()
+    
+    async def _query_async(self, 
+                           user_query: str, 
+                           max_results: Optional[int] = Config.MAX_SEARCH_RESULTS,
+                           filters: str = None,
+                           model: str = None) -> Dict[str, Any]:
+        """Process a user query using RAG without blocking the event loop"""
+        try:
+            start_time = time.time()
+            logger.info("Processing query: '%s'", user_query)
+            
+            if max_results is None:
+                max_results = Config.MAX_SEARCH_RESULTS
+            loop = asyncio.get_running_loop()
+            search_results = await loop.run_in_executor(
+                None, self._smart_search, user_query, max_results, filters
+            )
+            
+            search_time = time.time() - start_time
+            
+            if not search_results['hits']:
+                return self._no_results(user_query, search_time, start_time)
             
             context_docs = search_results['hits']
+            
+            query_key = self._query_key(user_query, model, context_docs)
+            cached_result = self._query_cache.get(query_key)
+            if cached_result is not None:
+                return self._from_cache(cached_result, user_query, search_time, start_time)
+            
             is_personal_context = self._detect_personal_context(user_query)
             messages = self.openrouter_client.create_rag_prompt(user_query, context_docs, is_personal_context)
             
             llm_start_time = time.time()
-            llm_response = self.openrouter_client.generate_response(
+            llm_response = await self.openrouter_client.agenerate_response(
                 messages=messages,
                 model=model,
-                temperature=0.3,
-                max_tokens=800
+                temperature=_LLM_TEMP,
+                max_tokens=_LLM_MAX_TOKENS
             )
-            
             llm_time = time.time() - llm_start_time
-            total_time = time.time() - start_time
-            
             answer = llm_response['choices'][0]['message']['content']
             
-            sources = []
-            for doc in context_docs:
-                if is_personal_context:
-                    content = doc.get('content', '')
-                else:
-                    content = doc.get('business_content', doc.get('content', ''))  # Business content
-                
-                profit_data = None
-                if not is_personal_context and doc.get("profit") is not None:
-                    profit = doc.get("profit")
-                    if profit > 0:
-                        profit_data = f"+${profit:.2f}"  # Profit with + sign
-                    elif profit < 0:
-                        profit_data = f"-${abs(profit):.2f}"  # Loss with - sign
-                    else:
-                        profit_data = "$0.00"  # Zero profit
-
-                sources.append({
-                    "order_id": doc.get("order_id"),
-                    "category": doc.get("category"),
-                    "sub_category": doc.get("sub_category"),
-                    "amount": doc.get("amount"),
-                    "profit": profit_data,  # Formatted profit/loss data
-                    "content": content
-                })
-            
-            result = {
-                "query": user_query,
-                "answer": answer,
-                "context": context_docs,
-                "context_detected": "PERSONAL" if is_personal_context else "BUSINESS",
-                "search_time": search_time,
-                "llm_time": llm_time,
-                "total_time": total_time,
-                "sources": sources,
-                "search_stats": {
-                    "total_hits": search_results.get('estimatedTotalHits', 0),
-                    "processing_time_ms": search_results.get('processingTimeMs', 0)
-                }
-            }
+            total_time = time.time() - start_time
+            
+            result = self._build_result(
+                user_query, answer, context_docs, is_personal_context, search_results,
+                search_time, llm_time, total_time
+            )
+            self._query_cache[query_key] = _copy_query_result(result)
             
-            logger.info(f"Query completed in {total_time:.2f}s (search: {search_time:.2f}s, LLM: {llm_time:.2f}s)")
+            logger.info("Query completed in %.2fs (search: %.2fs, LLM: %.2fs)", total_time, search_time, llm_time)
             
             return result
             
@@ -287,19 +451,132 @@ class AgenticRAGSystem:
             logger.error(f"Error processing query: {e}")
             raise
     
+    def _query_key(self, user_query: str, model: str, context_docs: List[Dict[str, Any]]) -> str:
+        """Cache key for an answer: normalized query, model and the ids of its context documents"""
+        return _cache_key(
+            _normalize_query(user_query),
+            model or Config.LLM_MODEL,
+            [doc.get('id') for doc in context_docs]
+        )
+    
+    def _no_results(self, user_query: str, search_time: float, start_time: float) -> Dict[str, Any]:
+        """Result for a query whose search found no documents"""
+        logger.warning("No relevant documents found for query")
+        return {
+            "query": user_query,
+            "answer": "I couldn't find any relevant data to answer your question. Please try rephrasing your query.",
+            "context": [],
+            "search_time": search_time,
+            "llm_time": 0.0,
+            "total_time": time.time() - start_time,
+            "sources": [],
+            "search_stats": {
+                "total_hits": 0,
+                "processing_time_ms": 0
+            },
+            "cache_hit": False
+        }
+    
+    def _from_cache(self, 
+                    cached_result: Dict[str, Any], 
+                    user_query: str, 
+                    search_time: float, 
+                    start_time: float) -> Dict[str, Any]:
+        """Result for a query answered from the query cache"""
+        logger.info("Query cache hit")
+        return {
+            **_copy_query_result(cached_result),
+            "query": user_query,
+            "search_time": search_time,
+            "llm_time": 0.0,
+            "total_time": time.time() - start_time,
+            "cache_hit": True
+        }
+    
+    def _build_result(self, 
+                      user_query: str, 
+                      answer: str, 
+                      context_docs: List[Dict[str, Any]], 
+                      is_personal_context: bool, 
+                      search_results: Dict[str, Any], 
+                      search_time: float, 
+                      llm_time: float, 
+                      total_time: float) -> Dict[str, Any]:
+        """Assemble a query result, with sources formatted for the detected context"""
+        content_key = 'content' if is_personal_context else 'business_content'
+        format_profit = _no_profit if is_personal_context else _format_profit
+        sources = [
+            {
+                "order_id": doc.get("order_id"),
+                "category": doc.get("category"),
+                "sub_category": doc.get("sub_category"),
+                "amount": doc.get("amount"),
+                "profit": format_profit(doc.get("profit")),  # Formatted profit/loss data
+                "content": doc.get(content_key, doc.get('content', ''))
+            }
+            for doc in context_docs
+        ]
+        
+        return {
+            "query": user_query,
+            "answer": answer,
+            "context": context_docs,
+            "context_detected": "PERSONAL" if is_personal_context else "BUSINESS",
+            "search_time": search_time,
+            "llm_time": llm_time,
+            "total_time": total_time,
+            "sources": sources,
+            "search_stats": {
+                "total_hits": search_results.get('estimatedTotalHits', 0),
+                "processing_time_ms": search_results.get('processingTimeMs', 0)
+            },
+            "cache_hit": False
+        }
+    
+    def _stream_answer(self, 
+                       answer_stream: Iterator[str], 
+                       result: Dict[str, Any], 
+                       query_key: str, 
+                       start_time: float, 
+                       llm_start_time: float) -> Iterator[str]:
+        """Yield answer deltas as they arrive, then complete and cache the query result"""
+        parts = []
+        for delta in answer_stream:
+            parts.append(delta)
+            yield delta
+        
+        result["answer"] = "".join(parts)
+        result["llm_time"] = time.time() - llm_start_time
+        result["total_time"] = time.time() - start_time
+        cached_result = _copy_query_result(result)
+        cached_result.pop("answer_stream", None)
+        self._query_cache[query_key] = cached_result
+        
+        logger.info("Query completed in %.2fs (search: %.2fs, LLM: %.2fs)", result['total_time'], result['search_time'], result['llm_time'])
+    
+    def _component_status(self) -> Tuple[bool, bool]:
+        """Meilisearch and OpenRouter health, checked concurrently and cached briefly"""
+        status = self._status_cache.get('status')
+        if status is None:
+            meilisearch_health = self._status_pool.submit(self.meilisearch_client.health_check)
+            openrouter_health = self._status_pool.submit(self.openrouter_client.test_connection)
+            status = self._status_cache['status'] = (meilisearch_health.result(), openrouter_health.result())
+        return status
+    
     def get_system_info(self) -> Dict[str, Any]:
         """Get system information and status"""
         try:
+            meilisearch_healthy, openrouter_healthy = self._component_status()
             info = {
                 "system": "Agentic RAG System",
                 "version": "1.0.0",
                 "components": {
                     "meilisearch": {
-                        "status": "healthy" if self.meilisearch_client.health_check() else "unhealthy",
+                        "status": "healthy" if meilisearch_healthy else "unhealthy",
                         "url": self.meilisearch_client.url
                     },
                     "openrouter": {
-                        "status": "healthy" if self.openrouter_client.test_connection() else "unhealthy",
+                        "status": "healthy" if openrouter_healthy else "unhealthy",
                         "model": Config.LLM_MODEL
                     }
                 }
@@ -331,9 +608,11 @@ if __name__ == "__main__":
             query = " ".join(sys.argv[1:])
             print(f"\nQuery: {query}")
             
-            result = rag.query(query)
-            print(f"\n{result['answer']}")
-            print(f"Response time: {result['total_time']:.1f}s")
+            result = rag.query(query, stream=True)
+            print()
+            for delta in result['answer_stream']:
+                print(delta, end="", flush=True)
+            print(f"\nResponse time: {result['total_time']:.1f}s")
             
         else:
             print("\nE-commerce Data Assistant")
@@ -349,9 +628,11 @@ if __name__ == "__main__":
                     if not query:
                         continue
                     
-                    result = rag.query(query)
-                    print(f"\n{result['answer']}")
-                    print(f"Response time: {result['total_time']:.1f}s")
+                    result = rag.query(query, stream=True)
+                    print()
+                    for delta in result['answer_stream']:
+                        print(delta, end="", flush=True)
+                    print(f"\nResponse time: {result['total_time']:.1f}s")
                     print()
                     
                 except KeyboardInterrupt: